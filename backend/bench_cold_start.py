@@ -0,0 +1,116 @@
+"""Cold-start benchmark for the API.
+
+Each run starts a fresh interpreter, imports `main` and sends one request
+straight to the ASGI app, reporting import time and time-to-first-response.
+
+By default both /years, which loads the prewarmed metadata snapshot from a
+local fixture and creates the HTTP client lazily, and /health, which touches
+neither, are measured.
+
+Usage: python3 bench_cold_start.py [--runs 10] [--path /years --path /health]
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime, timezone
+
+CHILD = r"""
+import time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+import asyncio
+import json
+import sys
+
+path, _, query = sys.argv[1].partition("?")
+
+async def first_request():
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("localhost", 8000),
+    }
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await main.app(scope, receive, send)
+    return status
+
+status = asyncio.run(first_request())
+done = time.perf_counter()
+print(json.dumps({"import": imported - start, "first_response": done - start, "status": status}))
+"""
+
+def write_metadata_fixture(directory):
+    """Write a fresh metadata snapshot like the scraper publishes and return its path."""
+    tournaments = [
+        {"id": i, "name": f"Tournament {i}", "year": 2020 + i % 6, "division": "ATP" if i % 2 else "WTA",
+         "surface": "Hard", "category": "masters"}
+        for i in range(1, 61)
+    ]
+    path = os.path.join(directory, "metadata.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "years": sorted({t["year"] for t in tournaments}, reverse=True),
+            "tournaments": tournaments,
+        }, f)
+    return path
+
+def run_once(path, env):
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, path],
+        cwd=backend_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API cold-start latency.")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", action="append", help="request path, may be repeated (default: /years and /health)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, METADATA_SNAPSHOT=write_metadata_fixture(directory))
+        # Keep every run cold and offline: no shared response cache, no bucket fetch.
+        env.pop("SHARED_CACHE_DIR", None)
+        env.pop("SNAPSHOT_BUCKET", None)
+
+        for path in args.path or ["/years", "/health"]:
+            samples = [run_once(path, env) for _ in range(args.runs)]
+            statuses = sorted({s["status"] for s in samples})
+
+            print(f"Cold start over {args.runs} runs, first request GET {path} (status {statuses})")
+            for key, label in (("import", "Import time"), ("first_response", "Time to first response")):
+                values = [s[key] * 1000 for s in samples]
+                print(f"  {label:<24} median {statistics.median(values):7.1f} ms   min {min(values):7.1f} ms   max {max(values):7.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,81 @@
-from fastapi import FastAPI, HTTPException, Request, Depends
-import uvicorn
+from fastapi import FastAPI, HTTPException, Request, Depends, Response
 from fastapi.middleware.cors import CORSMiddleware
 import os
+import re
+import json
+import time
+import asyncio
+from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from fastapi.security import APIKeyHeader
 from starlette.status import HTTP_403_FORBIDDEN
-import httpx
-from dotenv import load_dotenv
 
-load_dotenv()
+# Serverless platforms inject configuration directly, so skip the .env lookup there.
+if not os.environ.get("VERCEL") and os.path.exists(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")):
+    from dotenv import load_dotenv
+    load_dotenv()
 
 SUPABASE_URL = os.environ.get("SUPABASE_URL")
 SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
 
-limiter = Limiter(key_func=get_remote_address)
+# Several workers need a shared backend (e.g. redis://host:6379): with memory://
+# every worker keeps its own counters and the limits are multiplied.
+RATE_LIMIT_STORAGE_URI = os.environ.get("RATE_LIMIT_STORAGE_URI", "memory://")
+SHARED_RATE_LIMITS = not RATE_LIMIT_STORAGE_URI.startswith("memory://")
+
+SHARED_CACHE_DIR = os.environ.get("SHARED_CACHE_DIR")
+if SHARED_CACHE_DIR:
+    from shared_cache import SharedCache
+    shared_cache = SharedCache(
+        SHARED_CACHE_DIR,
+        ttl=int(os.environ.get("SHARED_CACHE_TTL", "300")),
+        max_entries=int(os.environ.get("SHARED_CACHE_MAX_ENTRIES", "256")),
+        max_bytes=int(os.environ.get("SHARED_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    )
+else:
+    shared_cache = None
+
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "snapshots"))
+SNAPSHOT_BUCKET = os.environ.get("SNAPSHOT_BUCKET")
+SNAPSHOT_NAME = re.compile(r"^(manifest|metadata|(tournament|year)-\d+\.[0-9a-f]{12})\.json$")
+METADATA_SNAPSHOT = os.environ.get("METADATA_SNAPSHOT", os.path.join(SNAPSHOT_DIR, "metadata.json"))
+METADATA_SNAPSHOT_TTL = int(os.environ.get("METADATA_SNAPSHOT_TTL", "300"))
+METADATA_SNAPSHOT_MAX_AGE = int(os.environ.get("METADATA_SNAPSHOT_MAX_AGE", str(48 * 3600)))
+
+PLAYER_INDEX_TTL = int(os.environ.get("PLAYER_INDEX_TTL", "300"))
+PLAYER_MATCH_SELECT = "id,player_a,player_b,odds_a,odds_b,winner,updated_at,rounds!inner(name,tournaments!inner(surface))"
+
+if int(os.environ.get("WEB_CONCURRENCY", "1")) > 1 and not SHARED_RATE_LIMITS:
+    raise RuntimeError(
+        "WEB_CONCURRENCY > 1 requires a shared RATE_LIMIT_STORAGE_URI (e.g. redis://host:6379); "
+        "with memory:// each worker would enforce its own copy of every rate limit."
+    )
+
+limiter = Limiter(key_func=get_remote_address, storage_uri=RATE_LIMIT_STORAGE_URI)
 app = FastAPI(title="Grand Slam Analyzer API", root_path="/api")
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
-client = httpx.AsyncClient()
+client = None
+
+def get_client():
+    """Create the shared HTTP client on first use so cold starts don't pay for it."""
+    global client
+    if client is None:
+        import httpx
+        client = httpx.AsyncClient()
+    return client
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    await client.aclose()
+    if client is not None:
+        await client.aclose()
 
 allowed_origins = os.environ.get("ALLOWED_ORIGINS", "*").split(",")
 app.add_middleware(
@@ -38,7 +86,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+class SnapshotAwareGZipMiddleware(GZipMiddleware):
+    """GZip dynamic responses but pass precompressed snapshot files through untouched."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and "/snapshots/" in scope["path"]:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app.add_middleware(SnapshotAwareGZipMiddleware, minimum_size=1000)
 
 API_KEY = os.environ.get("API_KEY")
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
@@ -50,6 +107,91 @@ async def get_api_key(api_key_header: str = Depends(api_key_header)):
         )
     return api_key_header
 
+def cache_key(endpoint: str, **params):
+    """Build a shared-cache key from an endpoint's declared parameters only,
+    so undeclared query strings can't mint new cache entries."""
+    return f"{endpoint}?{sorted((k, v) for k, v in params.items() if v is not None)}"
+
+def cached_response(key: str):
+    """Return the shared cached response for this key, if any worker has stored one."""
+    if not shared_cache:
+        return None
+    payload = shared_cache.get(key)
+    if payload is None:
+        return None
+    return Response(content=payload, media_type="application/json")
+
+def store_response(key: str, data):
+    """Publish a successful, non-empty result to the shared cache and return it unchanged."""
+    if shared_cache and data:
+        shared_cache.set(key, json.dumps(data).encode())
+    return data
+
+_metadata_snapshot = {"key": None, "data": None}
+_metadata_snapshot_lock = None
+
+async def fetch_bucket_object(name: str):
+    """Fetch a published snapshot object from the public Supabase Storage bucket, or None"""
+    url = f"{SUPABASE_URL}/storage/v1/object/public/{SNAPSHOT_BUCKET}/{name}"
+    try:
+        response = await get_client().get(url)
+    except Exception as e:
+        print(f"Snapshot bucket error for {name}: {e}")
+        return None
+    if response.status_code != 200:
+        return None
+    return response.content
+
+def _fresh_metadata(data):
+    """Return the metadata document unless it is older than METADATA_SNAPSHOT_MAX_AGE"""
+    try:
+        generated_at = datetime.fromisoformat(data["generated_at"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return None
+    if time.time() - generated_at > METADATA_SNAPSHOT_MAX_AGE:
+        return None
+    return data
+
+async def load_metadata_snapshot():
+    """Return the prewarmed metadata document, or None if there is no fresh one.
+       A local file is re-read when its modification time changes; otherwise the
+       scraper's metadata.json is fetched from the snapshot bucket at most once per
+       METADATA_SNAPSHOT_TTL."""
+    global _metadata_snapshot, _metadata_snapshot_lock
+    try:
+        key = ("file", os.stat(METADATA_SNAPSHOT).st_mtime)
+    except OSError:
+        if not (SNAPSHOT_BUCKET and SUPABASE_URL):
+            return None
+        key = ("bucket", int(time.time() // METADATA_SNAPSHOT_TTL))
+
+    if _metadata_snapshot["key"] != key:
+        if _metadata_snapshot_lock is None:
+            _metadata_snapshot_lock = asyncio.Lock()
+        async with _metadata_snapshot_lock:
+            if _metadata_snapshot["key"] != key:
+                data = None
+                try:
+                    if key[0] == "file":
+                        with open(METADATA_SNAPSHOT, encoding="utf-8") as f:
+                            data = json.load(f)
+                    else:
+                        payload = await fetch_bucket_object("metadata.json")
+                        data = json.loads(payload) if payload else None
+                except (OSError, ValueError) as e:
+                    print(f"Could not read metadata snapshot: {e}")
+                _metadata_snapshot = {"key": key, "data": data}
+
+    return _fresh_metadata(_metadata_snapshot["data"])
+
+async def snapshot_tournaments(**filters):
+    """Filter the prewarmed tournament metadata snapshot, or return None if there is no fresh one."""
+    snapshot = await load_metadata_snapshot()
+    if snapshot is None:
+        return None
+    tournaments = snapshot.get("tournaments") or []
+    return [t for t in tournaments if all(not value or t.get(key) == value for key, value in filters.items())]
+
 class Match(BaseModel):
     id: int
     round_name: str
@@ -77,9 +219,9 @@ async def supabase_request(method: str, endpoint: str, params: dict = None):
     }
 
     if method == "GET":
-        response = await client.get(url, headers=headers, params=params)
+        response = await get_client().get(url, headers=headers, params=params)
     elif method == "POST":
-        response = await client.post(url, headers=headers, json=params)
+        response = await get_client().post(url, headers=headers, json=params)
 
     if response.status_code != 200:
         raise HTTPException(status_code=response.status_code, detail=response.text)
@@ -96,6 +238,11 @@ async def get_tournaments_list(
     api_key: str = Depends(get_api_key)
 ):
     """Get list of tournaments for the given filters"""
+    key = cache_key("tournaments_list", year=year, division=division, category=category)
+    cached = cached_response(key)
+    if cached:
+        return cached
+
     params = {"select": "id,name,surface,category,division,year"}
     if year:
         params["year"] = f"eq.{year}"
@@ -105,12 +252,43 @@ async def get_tournaments_list(
         params["category"] = f"eq.{category}"
 
     try:
-        data = await supabase_request("GET", "tournaments", params)
-        return data if data else []
+        data = await snapshot_tournaments(year=year, division=division, category=category)
+        if data is None:
+            data = await supabase_request("GET", "tournaments", params)
+        return store_response(key, data) if data else []
     except Exception as e:
         print(f"Supabase error fetching tournaments: {e}")
         return []
 
+MATCH_SELECT = "id,player_a,player_b,odds_a,odds_b,winner,status,match_time,updated_at,rounds!inner(name,tournaments!inner(id,name,year,division,surface,category))"
+TOURNAMENT_META_FIELDS = ("name", "year", "division", "surface", "category")
+BATCH_CONCURRENCY = int(os.environ.get("BATCH_CONCURRENCY", "4"))
+BATCH_MAX_SHARDS = 20
+
+def match_query_params(limit, year=None, division=None, category=None, tournament_id=None):
+    """Build the PostgREST params for a matches query with tournament filters"""
+    params = {"select": MATCH_SELECT, "limit": limit}
+
+    if tournament_id:
+        params["rounds.tournaments.id"] = f"eq.{tournament_id}"
+    else:
+        if year:
+            params["rounds.tournaments.year"] = f"eq.{year}"
+        if division:
+            params["rounds.tournaments.division"] = f"eq.{division}"
+        if category:
+            params["rounds.tournaments.category"] = f"eq.{category}"
+
+    return params
+
+def _parse_int_list(value: Optional[str]):
+    if not value:
+        return []
+    try:
+        return list(dict.fromkeys(int(v) for v in value.split(",") if v.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid id list: {value}")
+
 @app.get("/matches", response_model=List[Match])
 @limiter.limit("60/minute")
 async def get_matches(
@@ -123,19 +301,12 @@ async def get_matches(
     api_key: str = Depends(get_api_key)
 ):
     """Get matches with optional filters"""
+    key = cache_key("matches", limit=limit, year=year, division=division, category=category, tournament_id=tournament_id)
+    cached = cached_response(key)
+    if cached:
+        return cached
 
-    select_query = "id,player_a,player_b,odds_a,odds_b,winner,status,match_time,updated_at,rounds!inner(name,tournaments!inner(id,name,year,division,surface,category))"
-    params = {"select": select_query, "limit": limit}
-
-    if tournament_id:
-        params["rounds.tournaments.id"] = f"eq.{tournament_id}"
-    else:
-        if year:
-            params["rounds.tournaments.year"] = f"eq.{year}"
-        if division:
-            params["rounds.tournaments.division"] = f"eq.{division}"
-        if category:
-            params["rounds.tournaments.category"] = f"eq.{category}"
+    params = match_query_params(limit, year, division, category, tournament_id)
 
     try:
         data = await supabase_request("GET", "matches", params)
@@ -166,11 +337,96 @@ async def get_matches(
                 print(f"Skipping malformed row: {e}")
                 continue
 
-        return matches
+        return store_response(key, matches)
     except Exception as e:
         print(f"Supabase error: {e}")
         return []
 
+@app.get("/matches/batch")
+@limiter.limit("20/minute")
+async def get_matches_batch(
+    request: Request,
+    tournament_ids: Optional[str] = None,
+    years: Optional[str] = None,
+    division: Optional[str] = None,
+    category: Optional[str] = None,
+    limit: int = 2000,
+    api_key: str = Depends(get_api_key)
+):
+    """Get matches for several tournaments and/or years in one round-trip.
+    Shards are fetched concurrently; tournament metadata is returned once per tournament."""
+    tournament_id_list = _parse_int_list(tournament_ids)
+    year_list = _parse_int_list(years)
+
+    key = cache_key(
+        "matches_batch",
+        tournament_ids=tuple(tournament_id_list),
+        years=tuple(year_list),
+        division=division,
+        category=category,
+        limit=limit,
+    )
+    cached = cached_response(key)
+    if cached:
+        return cached
+
+    shards = [{"tournament_id": t_id} for t_id in tournament_id_list]
+    shards += [{"year": year, "division": division, "category": category} for year in year_list]
+    if not shards:
+        raise HTTPException(status_code=400, detail="Provide tournament_ids or years")
+    if len(shards) > BATCH_MAX_SHARDS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_SHARDS} tournaments/years per request")
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def fetch_shard(shard):
+        async with semaphore:
+            return await supabase_request("GET", "matches", match_query_params(limit, **shard))
+
+    shard_results = await asyncio.gather(*(fetch_shard(shard) for shard in shards), return_exceptions=True)
+
+    tournaments = {}
+    matches = {}
+    errors = []
+    for shard, data in zip(shards, shard_results):
+        if isinstance(data, Exception):
+            print(f"Supabase error for batch shard {shard}: {data}")
+            errors.append({**{k: v for k, v in shard.items() if v}, "detail": str(getattr(data, "detail", data))})
+            continue
+
+        for row in data or []:
+            try:
+                tournament = row["rounds"]["tournaments"]
+                tournaments.setdefault(tournament["id"], {
+                    "id": tournament["id"],
+                    **{field: tournament.get(field) for field in TOURNAMENT_META_FIELDS},
+                })
+                matches[row["id"]] = {
+                    "id": row["id"],
+                    "tournament_id": tournament["id"],
+                    "round_name": row["rounds"]["name"],
+                    "player_a": row["player_a"],
+                    "player_b": row["player_b"],
+                    "odds_a": row.get("odds_a"),
+                    "odds_b": row.get("odds_b"),
+                    "winner": row.get("winner"),
+                    "status": row["status"],
+                    "match_time": row.get("match_time"),
+                    "updated_at": row.get("updated_at"),
+                }
+            except (KeyError, TypeError) as e:
+                print(f"Skipping malformed row: {e}")
+                continue
+
+    result = {
+        "tournaments": list(tournaments.values()),
+        "matches": list(matches.values()),
+        "errors": errors,
+    }
+    if errors:
+        return result
+    return store_response(key, result)
+
 @app.get("/divisions", response_model=List[str])
 @limiter.limit("60/minute")
 async def get_divisions(
@@ -182,6 +438,11 @@ async def get_divisions(
     api_key: str = Depends(get_api_key)
 ):
     """Get available divisions"""
+    key = cache_key("divisions", year=year, category=category, tournament_id=tournament_id, name=name)
+    cached = cached_response(key)
+    if cached:
+        return cached
+
     params = {"select": "division"}
     if year:
         params["year"] = f"eq.{year}"
@@ -193,10 +454,12 @@ async def get_divisions(
         params["name"] = f"eq.{name}"
 
     try:
-        data = await supabase_request("GET", "tournaments", params)
+        data = await snapshot_tournaments(year=year, category=category, id=tournament_id, name=name)
+        if data is None:
+            data = await supabase_request("GET", "tournaments", params)
         divisions = list(set([row["division"] for row in data]))
         divisions.sort(key=lambda x: (x != "ATP", x))
-        return divisions
+        return store_response(key, divisions)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -208,16 +471,23 @@ async def get_categories(
     api_key: str = Depends(get_api_key)
 ):
     """Get available tournament categories (grand_slam, masters) for a given year"""
+    key = cache_key("categories", year=year)
+    cached = cached_response(key)
+    if cached:
+        return cached
+
     params = {"select": "category"}
     if year:
         params["year"] = f"eq.{year}"
 
     try:
-        data = await supabase_request("GET", "tournaments", params)
+        data = await snapshot_tournaments(year=year)
+        if data is None:
+            data = await supabase_request("GET", "tournaments", params)
         categories = list(set([row["category"] for row in data if row.get("category")]))
         if not categories:
-            categories = ["grand_slam"]
-        return categories
+            return ["grand_slam"]
+        return store_response(key, categories)
     except Exception as e:
         return ["grand_slam"]
 
@@ -225,18 +495,206 @@ async def get_categories(
 @limiter.limit("60/minute")
 async def get_years(request: Request, api_key: str = Depends(get_api_key)):
     """Get available years"""
+    key = cache_key("years")
+    cached = cached_response(key)
+    if cached:
+        return cached
+
     params = {"select": "year", "order": "year.desc"}
 
     try:
-        data = await supabase_request("GET", "tournaments", params)
+        data = await snapshot_tournaments()
+        if data is None:
+            data = await supabase_request("GET", "tournaments", params)
         years = list(set([row["year"] for row in data]))
-        return sorted(years, reverse=True)
+        return store_response(key, sorted(years, reverse=True))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+player_index = None
+_player_index_refreshed = 0.0
+_player_index_lock = None
+
+async def get_player_index():
+    """Return the player index, fetching only matches updated since the last refresh"""
+    global player_index, _player_index_refreshed, _player_index_lock
+
+    if player_index is not None and time.monotonic() - _player_index_refreshed < PLAYER_INDEX_TTL:
+        return player_index
+
+    if _player_index_lock is None:
+        _player_index_lock = asyncio.Lock()
+
+    async with _player_index_lock:
+        if player_index is not None and time.monotonic() - _player_index_refreshed < PLAYER_INDEX_TTL:
+            return player_index
+
+        from players import PlayerIndex
+        index = player_index or PlayerIndex()
+        params = {"select": PLAYER_MATCH_SELECT, "order": "updated_at,id"}
+        if index.last_updated:
+            params["updated_at"] = f"gte.{index.last_updated}"
+
+        page_size = 1000
+        offset = 0
+        while True:
+            page = await supabase_request("GET", "matches", dict(params, limit=page_size, offset=offset))
+            index.apply(page)
+            if len(page) < page_size:
+                break
+            offset += page_size
+
+        player_index = index
+        _player_index_refreshed = time.monotonic()
+        return player_index
+
+@app.get("/players")
+@limiter.limit("60/minute")
+async def search_players(
+    request: Request,
+    prefix: str = "",
+    limit: int = 10,
+    api_key: str = Depends(get_api_key)
+):
+    """Autocomplete player names by prefix"""
+    try:
+        index = await get_player_index()
+    except Exception as e:
+        print(f"Supabase error building player index: {e}")
+        return []
+    return index.search(prefix, min(limit, 50))
+
+@app.get("/players/{name}/record")
+@limiter.limit("60/minute")
+async def get_player_record(
+    request: Request,
+    name: str,
+    api_key: str = Depends(get_api_key)
+):
+    """Get a player's underdog/favorite record overall, per surface and per round"""
+    try:
+        index = await get_player_index()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    record = index.record(name)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return record
+
+@app.get("/odds/movement")
+@limiter.limit("60/minute")
+async def get_odds_movement(
+    request: Request,
+    tournament_id: Optional[int] = None,
+    match_ids: Optional[str] = None,
+    include_series: bool = False,
+    limit: int = 2000,
+    api_key: str = Depends(get_api_key)
+):
+    """Get opening/closing odds and line movement for many matches at once"""
+    if not tournament_id and not match_ids:
+        raise HTTPException(status_code=400, detail="Provide tournament_id or match_ids")
+
+    from odds_series import decode_series, summarize_series
+
+    params = {
+        "select": "id,player_a,player_b,odds_history(series),rounds!inner(name,tournaments!inner(id))",
+        "limit": limit,
+    }
+    if tournament_id:
+        params["rounds.tournaments.id"] = f"eq.{tournament_id}"
+    if match_ids:
+        ids = [i.strip() for i in match_ids.split(",") if i.strip().isdigit()]
+        if not ids:
+            raise HTTPException(status_code=400, detail="match_ids must contain numeric ids")
+        params["id"] = f"in.({','.join(ids)})"
+
+    try:
+        data = await supabase_request("GET", "matches", params)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    results = []
+    for row in data or []:
+        history = row.get("odds_history")
+        if isinstance(history, list):
+            history = history[0] if history else None
+        series = history.get("series") if history else None
+        summary = summarize_series(series)
+        if not summary:
+            continue
+
+        entry = {
+            "id": row["id"],
+            "round_name": row["rounds"]["name"] if row.get("rounds") else "Unknown",
+            "player_a": row["player_a"],
+            "player_b": row["player_b"],
+            **summary,
+        }
+        if include_series:
+            entry["series"] = [{"at": t, "odds_a": a, "odds_b": b} for t, a, b in decode_series(series)]
+        results.append(entry)
+
+    return results
+
+@app.get("/snapshots/{name}")
+async def get_snapshot(
+    name: str,
+    request: Request,
+    api_key: str = Depends(get_api_key)
+):
+    """Serve a precompressed, content-hashed snapshot written by the scraper"""
+    if not SNAPSHOT_NAME.match(name):
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+    if name in ("manifest.json", "metadata.json"):
+        cache_control = "public, max-age=300, s-maxage=300"
+        candidates = [(None, "")]
+    else:
+        # s-maxage lets the Vercel edge cache keep the response, so repeat hits skip the function.
+        cache_control = "public, max-age=31536000, s-maxage=31536000, immutable"
+        accept_encoding = request.headers.get("accept-encoding", "")
+        candidates = [(e, suffix) for e, suffix in (("br", ".br"), ("gzip", ".gz")) if e in accept_encoding]
+        candidates.append((None, ""))
+
+    headers = {"Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+
+    path = os.path.join(SNAPSHOT_DIR, name)
+    for encoding, suffix in candidates:
+        if os.path.exists(path + suffix):
+            if encoding:
+                headers["Content-Encoding"] = encoding
+            return FileResponse(path + suffix, media_type="application/json", headers=headers)
+
+    if SNAPSHOT_BUCKET and SUPABASE_URL:
+        for encoding, suffix in candidates:
+            payload = await fetch_bucket_object(name + suffix)
+            if payload is None:
+                continue
+            if encoding:
+                headers["Content-Encoding"] = encoding
+            return Response(content=payload, media_type="application/json", headers=headers)
+
+    raise HTTPException(status_code=404, detail="Snapshot not found")
+
 @app.get("/health")
 def health_check():
     return {"status": "ok", "database": "supabase"}
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    import uvicorn
+
+    port = int(os.environ.get("PORT", "8000"))
+    if os.environ.get("SERVE_MODE") == "production":
+        workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+        if workers > 1 and not SHARED_RATE_LIMITS:
+            print("RATE_LIMIT_STORAGE_URI is not set; running a single worker so rate limits hold.")
+            workers = 1
+        # Workers are spawned as new processes and inherit the environment.
+        os.environ["WEB_CONCURRENCY"] = str(workers)
+        if not SHARED_CACHE_DIR:
+            os.environ["SHARED_CACHE_DIR"] = "/dev/shm/grandslam-cache" if os.path.isdir("/dev/shm") else "/tmp/grandslam-cache"
+        uvicorn.run("main:app", host="0.0.0.0", port=port, workers=workers, proxy_headers=True)
+    else:
+        uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
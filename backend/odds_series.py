@@ -0,0 +1,68 @@
+"""Compact delta-encoded odds time series.
+
+A series stores the first observation in full and every later change as
+integer deltas, with odds in hundredths and times in seconds:
+
+    {"t0": 1767225600, "a0": 185, "b0": 195, "d": [dt, da, db, ...], "seen": 1767312000}
+
+Observations that repeat the current odds only move `seen`, so a series grows
+with line movements rather than with how often the scraper runs.
+"""
+
+
+def _hundredths(odds):
+    return int(round(float(odds) * 100))
+
+
+def append_observation(series, timestamp, odds_a, odds_b):
+    """Return (series, changed) after recording odds seen at `timestamp` (epoch seconds)."""
+    timestamp = int(timestamp)
+    a, b = _hundredths(odds_a), _hundredths(odds_b)
+
+    if not series:
+        return {"t0": timestamp, "a0": a, "b0": b, "d": [], "seen": timestamp}, True
+
+    points = decode_series(series, raw=True)
+    last_t, last_a, last_b = points[-1]
+    series = dict(series, seen=max(series.get("seen", last_t), timestamp))
+    if (a, b) == (last_a, last_b) or timestamp <= last_t:
+        return series, False
+
+    series["d"] = list(series.get("d", [])) + [timestamp - last_t, a - last_a, b - last_b]
+    return series, True
+
+
+def decode_series(series, raw=False):
+    """Expand a series into [(timestamp, odds_a, odds_b), ...]; `raw` keeps odds in hundredths."""
+    if not series:
+        return []
+
+    t, a, b = series["t0"], series["a0"], series["b0"]
+    points = [(t, a, b)]
+    deltas = series.get("d", [])
+    for i in range(0, len(deltas) - 2, 3):
+        t += deltas[i]
+        a += deltas[i + 1]
+        b += deltas[i + 2]
+        points.append((t, a, b))
+
+    if raw:
+        return points
+    return [(t, a / 100, b / 100) for t, a, b in points]
+
+
+def summarize_series(series):
+    """Opening and closing odds plus line movement for one series."""
+    points = decode_series(series)
+    if not points:
+        return None
+
+    open_t, open_a, open_b = points[0]
+    close_t, close_a, close_b = points[-1]
+    return {
+        "opening": {"odds_a": open_a, "odds_b": open_b, "at": open_t},
+        "closing": {"odds_a": close_a, "odds_b": close_b, "at": close_t},
+        "movement": {"odds_a": round(close_a - open_a, 2), "odds_b": round(close_b - open_b, 2)},
+        "changes": len(points) - 1,
+        "last_seen": series.get("seen", close_t),
+    }
@@ -0,0 +1,126 @@
+"""In-memory player index with prefix search and precomputed underdog/favorite records.
+
+The index is built from stored matches and refreshed incrementally: only rows
+updated since the last refresh are fetched, and only the players in those rows
+have their records recomputed.
+"""
+import re
+import bisect
+import unicodedata
+from collections import defaultdict
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and collapse whitespace so 'Đoković N.' matches 'djokovic'."""
+    name = name.replace("đ", "dj").replace("Đ", "Dj")
+    name = unicodedata.normalize("NFKD", name)
+    name = "".join(c for c in name if not unicodedata.combining(c))
+    return re.sub(r"\s+", " ", name).strip().lower()
+
+
+def _empty_split():
+    return {"underdog": {"wins": 0, "losses": 0}, "favorite": {"wins": 0, "losses": 0}}
+
+
+class PlayerIndex:
+    def __init__(self):
+        self.matches = {}
+        self.by_player = defaultdict(set)
+        self.display_names = {}
+        self.records = {}
+        self.keys = []
+        self.last_updated = None
+
+    def apply(self, rows):
+        """Merge match rows (with embedded round and tournament surface) into the index."""
+        affected = set()
+        new_keys = []
+        for row in rows:
+            match_id = row["id"]
+            previous = self.matches.get(match_id)
+            if previous:
+                for side in ("player_a", "player_b"):
+                    self.by_player[previous[side]].discard(match_id)
+                    affected.add(previous[side])
+
+            rounds = row.get("rounds") or {}
+            tournament = rounds.get("tournaments") or {}
+            match = {
+                "player_a": normalize_name(row["player_a"]),
+                "player_b": normalize_name(row["player_b"]),
+                "odds_a": row.get("odds_a"),
+                "odds_b": row.get("odds_b"),
+                "winner": normalize_name(row["winner"]) if row.get("winner") else None,
+                "round": rounds.get("name", "Unknown"),
+                "surface": tournament.get("surface") or "Unknown",
+            }
+            self.matches[match_id] = match
+
+            for side in ("player_a", "player_b"):
+                key = match[side]
+                self.by_player[key].add(match_id)
+                affected.add(key)
+                if key not in self.display_names:
+                    self.display_names[key] = row[side].strip()
+                    new_keys.extend(self._search_keys(key))
+
+            if row.get("updated_at") and (self.last_updated is None or row["updated_at"] > self.last_updated):
+                self.last_updated = row["updated_at"]
+
+        if new_keys:
+            self.keys = sorted(self.keys + new_keys)
+
+        for key in affected:
+            self.records[key] = self._compute_record(key)
+
+    def _search_keys(self, key):
+        # Index every word start so 'sin' and 'jan' both find 'sinner jannik'.
+        words = key.split(" ")
+        return [(" ".join(words[i:]), key) for i in range(len(words))]
+
+    def _compute_record(self, key):
+        record = {
+            "name": self.display_names[key],
+            "matches": 0,
+            **_empty_split(),
+            "by_surface": defaultdict(_empty_split),
+            "by_round": defaultdict(_empty_split),
+        }
+        for match_id in self.by_player[key]:
+            m = self.matches[match_id]
+            record["matches"] += 1
+            if not m["winner"] or not m["odds_a"] or not m["odds_b"] or m["odds_a"] == m["odds_b"]:
+                continue
+
+            own, other = ("odds_a", "odds_b") if m["player_a"] == key else ("odds_b", "odds_a")
+            role = "underdog" if m[own] > m[other] else "favorite"
+            outcome = "wins" if m["winner"] == key else "losses"
+            for bucket in (record, record["by_surface"][m["surface"]], record["by_round"][m["round"]]):
+                bucket[role][outcome] += 1
+
+        record["by_surface"] = dict(record["by_surface"])
+        record["by_round"] = dict(record["by_round"])
+        return record
+
+    def search(self, prefix, limit=10):
+        """Return up to `limit` players whose name (or any later word of it) starts with `prefix`."""
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+
+        results = []
+        seen = set()
+        i = bisect.bisect_left(self.keys, (prefix,))
+        while i < len(self.keys) and len(results) < limit:
+            search_key, key = self.keys[i]
+            if not search_key.startswith(prefix):
+                break
+            if key not in seen:
+                seen.add(key)
+                results.append({"name": self.display_names[key], "matches": len(self.by_player[key])})
+            i += 1
+        return results
+
+    def record(self, name):
+        """Return the precomputed record for a player, or None if unknown."""
+        return self.records.get(normalize_name(name))
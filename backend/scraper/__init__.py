@@ -1 +1 @@
-from .database import save_to_db, get_existing_match_ids_from_supabase
+from .database import save_to_db, get_existing_match_ids_from_supabase, upsert_tournament, upsert_matches
@@ -0,0 +1,55 @@
+"""Local checkpoint files so an interrupted scrape resumes where it stopped."""
+import os
+import json
+import time
+
+from .config import STATE_DIR, CHECKPOINT_MAX_AGE
+
+CHECKPOINT_DIR = os.path.join(STATE_DIR, "checkpoints")
+
+def _checkpoint_path(tournament_key):
+    return os.path.join(CHECKPOINT_DIR, f"{tournament_key}.json")
+
+def has_checkpoint(tournament_key):
+    """Return True if a recent unfinished run left a checkpoint for this tournament."""
+    uploaded, _ = load_checkpoint(tournament_key)
+    return bool(uploaded)
+
+def load_checkpoint(tournament_key):
+    """Return (uploaded match URLs, run start time) left by an unfinished run.
+
+    Checkpoints older than CHECKPOINT_MAX_AGE are discarded: matches that were
+    upcoming then may have results or new odds now and must be scraped again.
+    """
+    try:
+        with open(_checkpoint_path(tournament_key), encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return set(), None
+    except Exception as e:
+        print(f"  Warning: Ignoring unreadable checkpoint for '{tournament_key}': {e}")
+        return set(), None
+
+    started_at = data.get("started_at")
+    if not started_at or time.time() - started_at > CHECKPOINT_MAX_AGE:
+        print(f"  Ignoring stale checkpoint for '{tournament_key}'.")
+        clear_checkpoint(tournament_key)
+        return set(), None
+
+    return set(data.get("uploaded", [])), started_at
+
+def save_checkpoint(tournament_key, uploaded, started_at):
+    """Atomically persist the set of uploaded match URLs and when the run started."""
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    path = _checkpoint_path(tournament_key)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"tournament_key": tournament_key, "started_at": started_at, "uploaded": sorted(uploaded)}, f)
+    os.replace(tmp_path, path)
+
+def clear_checkpoint(tournament_key):
+    """Remove the checkpoint once a run has completed."""
+    try:
+        os.remove(_checkpoint_path(tournament_key))
+    except FileNotFoundError:
+        pass
@@ -4,6 +4,19 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATE_DIR = os.environ.get("SCRAPER_STATE_DIR", os.path.join(BACKEND_DIR, "data"))
+UPLOAD_BATCH_SIZE = int(os.environ.get("SCRAPER_UPLOAD_BATCH_SIZE", "10"))
+# A checkpoint older than one run's window (the 6h GitHub Actions job limit) is stale.
+CHECKPOINT_MAX_AGE = int(os.environ.get("SCRAPER_CHECKPOINT_MAX_AGE", str(6 * 3600)))
+CHROME_PROFILE_DIR = os.environ.get("SCRAPER_CHROME_PROFILE")
+SNAPSHOT_DIR = os.environ.get("SNAPSHOT_DIR", os.path.join(STATE_DIR, "snapshots"))
+SNAPSHOT_BUCKET = os.environ.get("SNAPSHOT_BUCKET")
+MAX_ATTEMPTS = int(os.environ.get("SCRAPER_MAX_ATTEMPTS", "4"))
+RETRY_BASE_DELAY = float(os.environ.get("SCRAPER_RETRY_BASE_DELAY", "5"))
+RATE_LIMIT = float(os.environ.get("SCRAPER_RATE_LIMIT", "0.5"))
+MAX_RATE_LIMIT = float(os.environ.get("SCRAPER_MAX_RATE_LIMIT", "2"))
+
 urls_json = os.environ.get("TOURNAMENT_URLS_JSON")
 TOURNAMENT_URLS = {}
 
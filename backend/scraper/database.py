@@ -1,7 +1,9 @@
 import os
 import requests
 import sys
+from datetime import datetime, timezone
 
+FINAL_ROUND_NAMES = ('döntő', 'final', 'the final')
 
 def get_existing_match_ids_from_supabase():
     """Fetch all external_ids from Supabase to skip already processed matches."""
@@ -69,7 +71,7 @@ def is_tournament_finished(tournament_key):
             for r in rounds:
                 r_name = str(r.get('name', '')).strip()
                 r_name_lower = r_name.lower()
-                is_final = r_name_lower in ('döntő', 'final', 'the final') or r_name_lower == 'final'
+                is_final = r_name_lower in FINAL_ROUND_NAMES
                 if is_final:
                     matches = r.get('matches') or []
                     for m in matches:
@@ -85,27 +87,79 @@ def is_tournament_finished(tournament_key):
         return False
 
 
-def save_to_db(data):
-    """Save scraped data to Supabase via REST API."""
+def get_tournament_statuses(tournament_keys):
+    """Fetch the scrape status of many tournaments with a single query.
+       Returns {tournament_key: 'finished' | 'in_progress' | 'not_started'}, or None on error."""
     supabase_url = os.environ.get("SUPABASE_URL")
     supabase_key = os.environ.get("SUPABASE_KEY")
     
     if not supabase_url or not supabase_key:
-        print("Error: SUPABASE_URL and SUPABASE_KEY must be set.")
-        return False
-    
-    print("Saving to Supabase REST API...")
-    
-    t_key = data['tournament_key']
-    t_division = 'WTA' if '_wta' in t_key.lower() else 'ATP'
+        return None
 
+    if not tournament_keys:
+        return {}
+
+    url = f"{supabase_url}/rest/v1/tournaments"
+    params = {
+        "select": "external_id,rounds(name,matches(winner,status))",
+        "external_id": f"in.({','.join(tournament_keys)})",
+        "rounds.or": f"({','.join(f'name.ilike.{name}' for name in FINAL_ROUND_NAMES)})",
+        "rounds.matches.status": "eq.finished",
+    }
+    headers = {
+        "apikey": supabase_key,
+        "Authorization": f"Bearer {supabase_key}",
+    }
+
+    try:
+        response = requests.get(url, headers=headers, params=params, timeout=10)
+        if response.status_code != 200:
+            print(f"  Warning: Could not fetch tournament statuses: {response.text}")
+            return None
+
+        statuses = {key: 'not_started' for key in tournament_keys}
+        for t_data in response.json():
+            finished = any(
+                m.get('winner')
+                for r in (t_data.get('rounds') or [])
+                if str(r.get('name', '')).strip().lower() in FINAL_ROUND_NAMES
+                for m in (r.get('matches') or [])
+            )
+            statuses[t_data['external_id']] = 'finished' if finished else 'in_progress'
+        return statuses
+    except Exception as e:
+        print(f"  Error fetching tournament statuses: {e}")
+        return None
+
+
+def get_tournament_division(tournament_key):
+    """Derive the division (ATP/WTA) from the tournament key."""
+    return 'WTA' if '_wta' in tournament_key.lower() else 'ATP'
+
+
+def get_tournament_category(tournament_key):
+    """Look up the tournament category from the local config, defaulting to 'masters'."""
     try:
         if os.path.dirname(os.path.dirname(__file__)) not in sys.path:
             sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
         from config import get_category
-        t_category = get_category(t_key)
+        return get_category(tournament_key)
     except Exception:
-        t_category = 'masters'
+        return 'masters'
+
+
+def upsert_tournament(data):
+    """Upsert the tournament row described by `data` and return its id, or None on failure."""
+    supabase_url = os.environ.get("SUPABASE_URL")
+    supabase_key = os.environ.get("SUPABASE_KEY")
+    
+    if not supabase_url or not supabase_key:
+        print("Error: SUPABASE_URL and SUPABASE_KEY must be set.")
+        return None
+    
+    t_key = data['tournament_key']
+    t_division = data.get('division') or get_tournament_division(t_key)
+    t_category = data.get('category') or get_tournament_category(t_key)
 
     headers = {
         "apikey": supabase_key,
@@ -129,26 +183,62 @@ def save_to_db(data):
         res = response.json()
         if not res or not isinstance(res, list) or len(res) == 0:
             print(f"Supabase tournament upsert failed: {response.text}")
-            return False
-        t_id = res[0]['id']
+            return None
+        return res[0]['id']
     except Exception as e:
         print(f"Error upserting tournament: {e}")
+        return None
+
+
+def upsert_matches(t_id, matches, round_ids=None):
+    """Upsert a batch of scraped matches for tournament `t_id`.
+       `round_ids` caches round name -> id across calls so repeated batches skip the round upsert.
+       Returns True only if every match in the batch was stored."""
+    supabase_url = os.environ.get("SUPABASE_URL")
+    supabase_key = os.environ.get("SUPABASE_KEY")
+    
+    if not supabase_url or not supabase_key:
+        print("Error: SUPABASE_URL and SUPABASE_KEY must be set.")
         return False
+
+    if round_ids is None:
+        round_ids = {}
+
+    headers = {
+        "apikey": supabase_key,
+        "Authorization": f"Bearer {supabase_key}",
+        "Content-Type": "application/json",
+        "Prefer": "resolution=merge-duplicates,return=representation"
+    }
     
     matches_by_round = {}
-    for m in data.get('matches', []):
+    for m in matches:
         r_name = m.get('round', 'Unknown')
         if r_name not in matches_by_round:
             matches_by_round[r_name] = []
         matches_by_round[r_name].append(m)
 
+    # Nothing in the database bumps updated_at on upsert; the API's incremental
+    # player index refresh filters on it, so every write must set it.
+    updated_at = datetime.now(timezone.utc).isoformat()
+
+    ok = True
     for r_name, round_matches in matches_by_round.items():
-        r_url = f"{supabase_url}/rest/v1/rounds?on_conflict=tournament_id,name"
-        r_data = {"tournament_id": t_id, "name": r_name}
-        res_r = requests.post(r_url, headers=headers, json=r_data, timeout=10).json()
-        if not res_r or len(res_r) == 0:
-            continue
-        r_id = res_r[0]['id']
+        r_id = round_ids.get(r_name)
+        if r_id is None:
+            try:
+                r_url = f"{supabase_url}/rest/v1/rounds?on_conflict=tournament_id,name"
+                r_data = {"tournament_id": t_id, "name": r_name}
+                res_r = requests.post(r_url, headers=headers, json=r_data, timeout=10).json()
+            except Exception as e:
+                print(f"  Error upserting round '{r_name}': {e}")
+                ok = False
+                continue
+            if not res_r or not isinstance(res_r, list) or len(res_r) == 0:
+                ok = False
+                continue
+            r_id = res_r[0]['id']
+            round_ids[r_name] = r_id
         
         match_payloads = []
         for m in round_matches:
@@ -172,17 +262,37 @@ def save_to_db(data):
                 "status": "finished" if winner else "upcoming",
                 "match_time": m_time,
                 "match_url": m['id'],
-                "external_id": m['id']
+                "external_id": m['id'],
+                "updated_at": updated_at
             })
         
         if match_payloads:
             print(f"  Uploading {len(match_payloads)} matches for round '{r_name}'...")
             m_url = f"{supabase_url}/rest/v1/matches?on_conflict=external_id"
-            m_res = requests.post(m_url, headers=headers, json=match_payloads, timeout=10)
+            try:
+                m_res = requests.post(m_url, headers=headers, json=match_payloads, timeout=10)
+            except Exception as e:
+                print(f"  Warning: Failed to upload matches for round '{r_name}': {e}")
+                ok = False
+                continue
             if m_res.status_code not in [200, 201]:
                 print(f"  Warning: Failed to upload matches for round '{r_name}': {m_res.text}")
+                ok = False
             else:
                 print(f"  ✓ Uploaded {len(match_payloads)} matches.")
+
+    return ok
+
+
+def save_to_db(data):
+    """Save scraped data to Supabase via REST API."""
+    print("Saving to Supabase REST API...")
+
+    t_id = upsert_tournament(data)
+    if t_id is None:
+        return False
+
+    upsert_matches(t_id, data.get('matches', []))
     
     print(f"Successfully saved {data['tournament']} to Supabase.")
     return True
@@ -1,11 +1,26 @@
 """WebDriver setup for headless Chrome."""
+import os
+import glob
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 
-def setup_driver():
-    """Initialize and return a headless Chrome WebDriver."""
+from .config import CHROME_PROFILE_DIR
+
+def setup_driver(profile_dir=CHROME_PROFILE_DIR):
+    """Initialize and return a headless Chrome WebDriver.
+       With `profile_dir` set, cookies and cache persist in that Chrome profile across runs."""
     chrome_options = Options()
+    if profile_dir:
+        profile_dir = os.path.abspath(profile_dir)
+        # A profile restored from another machine may carry its lock files, which
+        # makes Chrome refuse to open it.
+        for name in glob.glob(os.path.join(profile_dir, "Singleton*")):
+            try:
+                os.remove(name)
+            except OSError:
+                pass
+        chrome_options.add_argument(f"--user-data-dir={profile_dir}")
     chrome_options.add_argument("--headless=new")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
@@ -7,6 +7,9 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 def accept_cookies(driver):
     """Accept cookie consent if present."""
+    if driver.get_cookie("OptanonAlertBoxClosed"):
+        return
+
     try:
         cookie_btn = WebDriverWait(driver, 3).until(
             EC.element_to_be_clickable((By.ID, "onetrust-accept-btn-handler"))
@@ -48,14 +51,18 @@ def get_tournament_surface(driver):
 
     return "Unknown"
 
-def get_match_links(driver, base_url):
-    """Extract match links from tournament page, skipping qualification rounds."""
+def get_match_links(driver, base_url, surface=None):
+    """Extract match links from tournament page, skipping qualification rounds.
+       Surface detection is skipped when a cached `surface` is passed in."""
     try:
         driver.get(base_url)
         accept_cookies(driver)
 
-        surface = get_tournament_surface(driver)
-        print(f"  Detected Surface: {surface}")
+        if surface and surface != "Unknown":
+            print(f"  Cached Surface: {surface}")
+        else:
+            surface = get_tournament_surface(driver)
+            print(f"  Detected Surface: {surface}")
 
         WebDriverWait(driver, 10).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, ".sportName.tennis"))
@@ -125,4 +132,4 @@ def get_match_links(driver, base_url):
 
     except Exception as e:
         print(f"Error getting match links: {e}")
-        return [], "Unknown"
+        return [], surface or "Unknown"
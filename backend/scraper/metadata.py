@@ -0,0 +1,40 @@
+"""Local cache of per-tournament metadata read from the source site (e.g. surface) that never changes between runs."""
+import os
+import json
+
+from .config import STATE_DIR
+
+METADATA_PATH = os.path.join(STATE_DIR, "tournaments.json")
+
+def _load_all():
+    try:
+        with open(METADATA_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"  Warning: Ignoring unreadable metadata cache: {e}")
+        return {}
+
+def load_metadata(tournament_key):
+    """Return the cached metadata dict for a tournament (empty if unknown)."""
+    return _load_all().get(tournament_key, {})
+
+def save_metadata(tournament_key, **fields):
+    """Merge `fields` into the cached metadata for a tournament, ignoring unknown values."""
+    fields = {k: v for k, v in fields.items() if v is not None and v != "Unknown"}
+    if not fields:
+        return
+
+    data = _load_all()
+    entry = data.get(tournament_key, {})
+    if all(entry.get(k) == v for k, v in fields.items()):
+        return
+    entry.update(fields)
+    data[tournament_key] = entry
+
+    os.makedirs(os.path.dirname(METADATA_PATH), exist_ok=True)
+    tmp_path = f"{METADATA_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, METADATA_PATH)
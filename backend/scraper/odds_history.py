@@ -0,0 +1,80 @@
+"""Persist per-match odds snapshots across runs as delta-encoded series.
+
+Expects this table next to `matches` (one row per match, not per observation):
+
+    create table odds_history (
+        external_id text primary key references matches(external_id) on delete cascade,
+        series jsonb not null,
+        updated_at timestamptz not null default now()
+    );
+"""
+import os
+import sys
+import time
+import requests
+from datetime import datetime, timezone
+
+if os.path.dirname(os.path.dirname(__file__)) not in sys.path:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from odds_series import append_observation
+
+
+def _quote(value):
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def record_odds_snapshots(matches, timestamp=None):
+    """Append the current odds of scraped matches to their stored series.
+       Each observation is dated by the match's `observedAt` (set when its page was
+       scraped), falling back to `timestamp`. Existing series are read and written
+       back with one request each per batch."""
+    supabase_url = os.environ.get("SUPABASE_URL")
+    supabase_key = os.environ.get("SUPABASE_KEY")
+
+    if not supabase_url or not supabase_key:
+        return False
+
+    observed = [m for m in matches if not (m.get('oddsA') == 1.0 and m.get('oddsB') == 1.0)]
+    if not observed:
+        return True
+
+    timestamp = timestamp or time.time()
+    headers = {
+        "apikey": supabase_key,
+        "Authorization": f"Bearer {supabase_key}",
+    }
+
+    try:
+        url = f"{supabase_url}/rest/v1/odds_history"
+        params = {
+            "select": "external_id,series",
+            "external_id": f"in.({','.join(_quote(m['id']) for m in observed)})",
+        }
+        response = requests.get(url, headers=headers, params=params, timeout=10)
+        if response.status_code != 200:
+            print(f"  Warning: Could not fetch odds history: {response.text}")
+            return False
+        existing = {row['external_id']: row['series'] for row in response.json()}
+
+        payloads = []
+        for m in observed:
+            observed_at = m.get('observedAt') or timestamp
+            series, _ = append_observation(existing.get(m['id']), observed_at, m['oddsA'], m['oddsB'])
+            payloads.append({
+                "external_id": m['id'],
+                "series": series,
+                "updated_at": datetime.fromtimestamp(observed_at, timezone.utc).isoformat(),
+            })
+
+        upsert_headers = dict(headers, **{
+            "Content-Type": "application/json",
+            "Prefer": "resolution=merge-duplicates,return=minimal",
+        })
+        response = requests.post(f"{url}?on_conflict=external_id", headers=upsert_headers, json=payloads, timeout=10)
+        if response.status_code not in [200, 201, 204]:
+            print(f"  Warning: Could not store odds history: {response.text}")
+            return False
+        return True
+    except Exception as e:
+        print(f"  Error recording odds history: {e}")
+        return False
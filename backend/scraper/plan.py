@@ -0,0 +1,46 @@
+"""Run planner: decide which tournaments need a browser before any is launched."""
+from .config import TOURNAMENT_URLS
+from .database import get_tournament_statuses
+from .checkpoint import has_checkpoint
+
+STATUS_ORDER = {"resume": 0, "in_progress": 1, "not_started": 2, "unknown": 3, "finished": 4}
+
+def plan_tournaments(tournament_keys=None):
+    """Return [(tournament_key, status), ...] ordered so resumable work comes first.
+
+    Statuses are resolved with a single Supabase query on every run, so a key
+    whose URL moves to a new edition is picked up again. If that query fails,
+    every tournament is planned as 'unknown' so the run still covers it.
+    """
+    if tournament_keys is None:
+        tournament_keys = list(TOURNAMENT_URLS.keys())
+
+    statuses = {}
+    to_query = []
+    for key in tournament_keys:
+        if key not in TOURNAMENT_URLS:
+            print(f"  Warning: Tournament '{key}' not supported, leaving it out of the plan.")
+        else:
+            to_query.append(key)
+
+    remote = get_tournament_statuses(to_query)
+    for key in to_query:
+        status = remote.get(key, "unknown") if remote is not None else "unknown"
+        if status != "finished" and has_checkpoint(key):
+            status = "resume"
+        statuses[key] = status
+
+    order = {key: i for i, key in enumerate(tournament_keys)}
+    return sorted(statuses.items(), key=lambda item: (STATUS_ORDER[item[1]], order[item[0]]))
+
+def work_list(plan):
+    """Tournament keys from a plan that still need scraping, in plan order."""
+    return [key for key, status in plan if status != "finished"]
+
+def print_plan(plan):
+    print(f"\n{'='*60}")
+    print("RUN PLAN")
+    for key, status in plan:
+        print(f"  {key:<30} {status}")
+    print(f"Tournaments to scrape: {len(work_list(plan))}/{len(plan)}")
+    print(f"{'='*60}\n")
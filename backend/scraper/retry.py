@@ -0,0 +1,49 @@
+"""Work queue that re-queues failed match URLs with exponential backoff."""
+import time
+import heapq
+import random
+
+from .config import MAX_ATTEMPTS, RETRY_BASE_DELAY
+
+class RetryQueue:
+    """Priority queue of (url, attempt) ordered by the time each URL becomes ready.
+
+    Fresh URLs are ready immediately and keep their original order. A failed URL
+    is pushed back with a delay of base_delay * 2**attempt (with jitter), so other
+    matches are processed while the source site recovers.
+    """
+
+    def __init__(self, urls, max_attempts=MAX_ATTEMPTS, base_delay=RETRY_BASE_DELAY, max_delay=300):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._seq = 0
+        self._heap = []
+        for url in urls:
+            self._push(url, 0, 0)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _push(self, url, attempt, ready_at):
+        heapq.heappush(self._heap, (ready_at, self._seq, url, attempt))
+        self._seq += 1
+
+    def pop(self):
+        """Return the next (url, attempt), sleeping until it is ready if necessary."""
+        ready_at, _, url, attempt = heapq.heappop(self._heap)
+        wait = ready_at - time.monotonic()
+        if wait > 0:
+            print(f"  Waiting {wait:.1f}s before retrying...")
+            time.sleep(wait)
+        return url, attempt
+
+    def retry(self, url, attempt):
+        """Re-queue a failed URL. Returns False once it has used up its attempts."""
+        attempt += 1
+        if attempt >= self.max_attempts:
+            return False
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        delay *= random.uniform(0.8, 1.2)
+        self._push(url, attempt, time.monotonic() + delay)
+        return True
@@ -3,33 +3,56 @@ import sys
 from .config import TOURNAMENT_URLS
 from .driver import setup_driver
 from .links import get_match_links
-from .extractor import extract_match_data
-from .database import get_existing_match_ids_from_supabase, save_to_db, is_tournament_finished
-
-def scrape_tournament(tournament_key):
+from .extractor import extract_match_data, ExtractionError, MatchUnavailableError
+from .database import (
+    get_existing_match_ids_from_supabase,
+    upsert_tournament,
+    is_tournament_finished,
+    get_tournament_category,
+    get_tournament_division,
+)
+from .metadata import load_metadata, save_metadata
+from .plan import plan_tournaments, work_list, print_plan
+from .checkpoint import load_checkpoint, clear_checkpoint
+from .uploader import MatchUploader
+from .retry import RetryQueue
+from .throttle import HostRateController
+from .snapshots import publish_snapshots
+
+def scrape_tournament(tournament_key, driver=None, check_finished=True, rate_controller=None, changed=None):
+    """Scrape one tournament. A `driver` passed in is reused and left open for the caller,
+       and a shared `rate_controller` keeps its learned per-host rates across tournaments.
+       The key is added to the `changed` set whenever matches were uploaded, even if the
+       run fails afterwards, since those rows are already in Supabase."""
     if tournament_key not in TOURNAMENT_URLS:
         print(f"Error: Tournament '{tournament_key}' not supported.")
         print(f"Available: {list(TOURNAMENT_URLS.keys())}")
         return False
 
-    print("Checking if tournament is already completely finished...")
-    if is_tournament_finished(tournament_key):
-        print(f"Tournament '{tournament_key}' is already finished and fully scraped. Skipping.")
-        return True
+    if check_finished:
+        print("Checking if tournament is already completely finished...")
+        if is_tournament_finished(tournament_key):
+            print(f"Tournament '{tournament_key}' is already finished and fully scraped. Skipping.")
+            return True
 
     base_url = TOURNAMENT_URLS[tournament_key]
-    driver = None
+    owns_driver = driver is None
+    if rate_controller is None:
+        rate_controller = HostRateController()
+    metadata = load_metadata(tournament_key)
 
     try:
         print(f"\n{'='*60}")
         print(f"Tournament Scraper: {tournament_key}")
         print(f"{'='*60}\n")
 
-        print("Initializing Chrome driver...")
-        driver = setup_driver()
+        if owns_driver:
+            print("Initializing Chrome driver...")
+            driver = setup_driver()
 
         print(f"Fetching match links from: {base_url}")
-        match_links, surface = get_match_links(driver, base_url)
+        rate_controller.acquire(base_url)
+        match_links, surface = get_match_links(driver, base_url, metadata.get("surface"))
 
         if not match_links:
             print("No matches found!")
@@ -37,51 +60,115 @@ def scrape_tournament(tournament_key):
 
         print(f"Found {len(match_links)} matches\n")
 
-        matches = []
+        tournament_data = {
+            "tournament_key": tournament_key,
+            "tournament": f"{tournament_key.replace('_', ' ').title()}",
+            "surface": surface,
+            "category": get_tournament_category(tournament_key),
+            "division": get_tournament_division(tournament_key),
+        }
+        print("Upserting tournament in Supabase...")
+        tournament_id = upsert_tournament(tournament_data)
+        if tournament_id is None:
+            return False
+
+        try:
+            # Only values read from the site are cached; category and division come
+            # from local config and defaults, which must not outlive a config change.
+            save_metadata(tournament_key, surface=surface)
+        except Exception as e:
+            print(f"Warning: Could not update metadata cache: {e}")
+
+        resumed, started_at = load_checkpoint(tournament_key)
+        if resumed:
+            print(f"Resuming from checkpoint: {len(resumed)} matches already uploaded.")
+
+        uploader = MatchUploader(tournament_key, tournament_id, resumed, started_at).start()
+
         successful = 0
         skipped = 0
+        unavailable = 0
         already_in_db = 0
+        already_uploaded = 0
+        requeued = 0
+        failed = 0
 
         existing_ids = get_existing_match_ids_from_supabase()
 
-        for i, match_url in enumerate(match_links, 1):
+        pending = []
+        for match_url in match_links:
             if match_url in existing_ids and existing_ids[match_url]:
                 already_in_db += 1
-                continue
-
-            action = "Updating" if match_url in existing_ids else "Processing"
-            print(f"[{i}/{len(match_links)}] {action}...")
-
-            match_data = extract_match_data(driver, match_url)
-
-            if match_data:
-                matches.append(match_data)
-                successful += 1
-                print(f"  ✓ {match_data['playerA']} ({match_data['oddsA']}) vs {match_data['playerB']} ({match_data['oddsB']}) - {match_data['round']}")
+            elif match_url in resumed:
+                already_uploaded += 1
             else:
-                skipped += 1
-                print(f"  ✗ Skipped (no odds/walkover)")
+                pending.append(match_url)
+
+        positions = {match_url: i for i, match_url in enumerate(match_links, 1)}
+        work = RetryQueue(pending)
+
+        try:
+            while work:
+                match_url, attempt = work.pop()
+                action = "Updating" if match_url in existing_ids else "Processing"
+                retry_note = f" (attempt {attempt + 1})" if attempt else ""
+                print(f"[{positions[match_url]}/{len(match_links)}] {action}{retry_note}...")
+
+                rate_controller.acquire(match_url)
+                try:
+                    match_data = extract_match_data(driver, match_url)
+                except MatchUnavailableError as e:
+                    unavailable += 1
+                    print(f"  ✗ Skipped (match page unavailable): {e}")
+                    continue
+                except ExtractionError as e:
+                    rate_controller.record_failure(match_url)
+                    if work.retry(match_url, attempt):
+                        requeued += 1
+                        print(f"  ↻ Re-queued after error: {e}")
+                    else:
+                        failed += 1
+                        print(f"  ✗ Giving up after {attempt + 1} attempts: {e}")
+                    continue
+                rate_controller.record_success(match_url)
+
+                if match_data:
+                    uploader.put(match_data)
+                    successful += 1
+                    print(f"  ✓ {match_data['playerA']} ({match_data['oddsA']}) vs {match_data['playerB']} ({match_data['oddsB']}) - {match_data['round']}")
+                else:
+                    skipped += 1
+                    print(f"  ✗ Skipped (no odds/walkover)")
+        finally:
+            print("Waiting for pending uploads...")
+            uploaded_ok = uploader.close()
+            if changed is not None and uploader.uploaded:
+                changed.add(tournament_key)
 
         print(f"\n{'='*60}")
         print(f"SCRAPING COMPLETE - {tournament_key}")
         print(f"Total processed: {len(match_links)}")
         print(f"Already in DB: {already_in_db} (skipped)")
+        print(f"Resumed from checkpoint: {already_uploaded} (skipped)")
         print(f"Newly scraped: {successful}")
-        print(f"Skipped (error): {skipped}")
+        print(f"Skipped (no odds/walkover): {skipped}")
+        print(f"Skipped (match page unavailable): {unavailable}")
+        print(f"Re-queued after errors: {requeued}")
+        print(f"Failed after retries: {failed}")
+        print(f"Failed uploads: {uploader.failed}")
         print(f"{'='*60}\n")
 
-        if matches:
-            data = {
-                "tournament_key": tournament_key,
-                "tournament": f"{tournament_key.replace('_', ' ').title()}",
-                "surface": surface,
-                "matches": matches
-            }
-            print("Uploading to Supabase...")
-            return save_to_db(data)
-        else:
-            print("No new matches to upload.")
-            return True
+        if not uploaded_ok:
+            print("Some batches failed to upload; checkpoint kept for the next run.")
+            return False
+
+        if failed:
+            print(f"{failed} matches failed after retries; checkpoint kept for the next run.")
+            return False
+
+        clear_checkpoint(tournament_key)
+        print(f"Successfully saved {tournament_data['tournament']} to Supabase.")
+        return True
 
     except Exception as e:
         print(f"\nUnexpected error: {e}")
@@ -89,21 +176,66 @@ def scrape_tournament(tournament_key):
         traceback.print_exc()
         return False
     finally:
-        if driver:
+        if owns_driver and driver:
             try:
                 driver.quit()
             except:
                 pass
 
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python3 -m scraper <tournament_key>")
+    args = sys.argv[1:]
+    if not args:
+        print("Usage: python3 -m scraper <tournament_key> [<tournament_key> ...]")
+        print("       python3 -m scraper plan [<tournament_key> ...]")
+        print("       python3 -m scraper all")
         print(f"Available tournaments: {list(TOURNAMENT_URLS.keys())}")
         sys.exit(1)
 
-    tournament_key = sys.argv[1]
-    success = scrape_tournament(tournament_key)
-    sys.exit(0 if success else 1)
+    if args[0] == "plan":
+        print_plan(plan_tournaments(args[1:] or None))
+        sys.exit(0)
+
+    tournament_keys = None if args == ["all"] else args
+    unsupported = [key for key in (tournament_keys or []) if key not in TOURNAMENT_URLS]
+    for key in unsupported:
+        print(f"Error: Tournament '{key}' not supported.")
+    if unsupported:
+        print(f"Available: {list(TOURNAMENT_URLS.keys())}")
+
+    plan = plan_tournaments(tournament_keys)
+    print_plan(plan)
+
+    driver = None
+    rate_controller = HostRateController()
+    failed = list(unsupported)
+    scraped = []
+    changed = set()
+    try:
+        for tournament_key in work_list(plan):
+            if driver is None:
+                print("Initializing shared Chrome driver...")
+                driver = setup_driver()
+            if scrape_tournament(tournament_key, driver, check_finished=False, rate_controller=rate_controller, changed=changed):
+                scraped.append(tournament_key)
+            else:
+                failed.append(tournament_key)
+    finally:
+        if driver:
+            try:
+                driver.quit()
+            except:
+                pass
+
+    # Failed tournaments may still have uploaded batches; their snapshots must not lag behind.
+    to_publish = [key for key in work_list(plan) if key in scraped or key in changed]
+    if to_publish:
+        print("Publishing snapshots...")
+        if not publish_snapshots(to_publish):
+            print("Warning: Snapshots could not be published.")
+
+    if failed:
+        print(f"Failed tournaments: {failed}")
+    sys.exit(1 if failed else 0)
 
 if __name__ == "__main__":
     main()
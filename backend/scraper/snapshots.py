@@ -0,0 +1,273 @@
+"""Precompressed, content-hashed snapshot artifacts of tournament and year match data.
+
+Snapshots only change after a scrape, so they are rendered once here and the
+API (or a CDN) serves the files as-is with long-lived caching headers.
+"""
+import os
+import gzip
+import json
+import hashlib
+import requests
+from datetime import datetime, timezone
+
+from .config import SNAPSHOT_DIR, SNAPSHOT_BUCKET
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PAGE_SIZE = 1000
+MATCH_SELECT = "id,player_a,player_b,odds_a,odds_b,winner,status,match_time,updated_at,rounds!inner(name,tournaments!inner(id,name,year,division,surface,category))"
+TOURNAMENT_FIELDS = ("id", "name", "year", "division", "surface", "category")
+MANIFEST_NAME = "manifest.json"
+METADATA_NAME = "metadata.json"
+
+
+def _headers(supabase_key):
+    return {
+        "apikey": supabase_key,
+        "Authorization": f"Bearer {supabase_key}",
+    }
+
+
+def _fetch_all(url, headers, params):
+    """Page through a PostgREST query until every row has been fetched."""
+    rows = []
+    offset = 0
+    while True:
+        page_params = dict(params, limit=PAGE_SIZE, offset=offset)
+        response = requests.get(url, headers=headers, params=page_params, timeout=30)
+        if response.status_code != 200:
+            raise RuntimeError(response.text)
+        page = response.json()
+        rows.extend(page)
+        if len(page) < PAGE_SIZE:
+            return rows
+        offset += PAGE_SIZE
+
+
+def flatten_match(row):
+    """Flatten a match row with embedded round/tournament into the API's match shape."""
+    tournament = row["rounds"]["tournaments"] if row.get("rounds") and row["rounds"].get("tournaments") else {}
+    return {
+        "id": row["id"],
+        "tournament_id": tournament.get("id"),
+        "round_name": row["rounds"]["name"] if row.get("rounds") else "Unknown",
+        "player_a": row["player_a"],
+        "player_b": row["player_b"],
+        "odds_a": row.get("odds_a"),
+        "odds_b": row.get("odds_b"),
+        "winner": row.get("winner"),
+        "status": row["status"],
+        "match_time": row.get("match_time"),
+        "updated_at": row.get("updated_at"),
+        "surface": tournament.get("surface", "Unknown"),
+        "category": tournament.get("category", "grand_slam"),
+    }
+
+
+def _load_manifest():
+    try:
+        with open(os.path.join(SNAPSHOT_DIR, MANIFEST_NAME), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+    manifest.setdefault("tournaments", {})
+    manifest.setdefault("years", {})
+    # Superseded files still to be deleted from the bucket; kept across runs until that succeeds.
+    manifest.setdefault("retired", [])
+    return manifest
+
+
+def _retire(manifest, previous, current):
+    """Queue the file `current` replaced for deletion from the bucket."""
+    if current["file"] in manifest["retired"]:
+        manifest["retired"].remove(current["file"])
+    if SNAPSHOT_BUCKET and previous and previous.get("file") != current["file"] and previous["file"] not in manifest["retired"]:
+        manifest["retired"].append(previous["file"])
+
+
+def _write_atomic(path, payload):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def write_snapshot(prefix, document, previous=None):
+    """Write `document` as <prefix>.<hash>.json plus .gz/.br variants and return its manifest entry."""
+    payload = json.dumps(document, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    digest = hashlib.sha256(payload).hexdigest()[:12]
+    name = f"{prefix}.{digest}.json"
+
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = os.path.join(SNAPSHOT_DIR, name)
+    if not os.path.exists(path):
+        _write_atomic(f"{path}.gz", gzip.compress(payload, compresslevel=9, mtime=0))
+        if brotli:
+            _write_atomic(f"{path}.br", brotli.compress(payload, quality=11))
+        _write_atomic(path, payload)
+
+    if previous and previous.get("file") != name:
+        for suffix in ("", ".gz", ".br"):
+            try:
+                os.remove(os.path.join(SNAPSHOT_DIR, previous["file"] + suffix))
+            except FileNotFoundError:
+                pass
+
+    return {"file": name, "hash": digest, "count": len(document.get("matches", []))}
+
+
+def upload_snapshot(supabase_url, supabase_key, name, cache_control, content_type="application/json"):
+    """Upload a snapshot file to the public Supabase Storage bucket."""
+    with open(os.path.join(SNAPSHOT_DIR, name), "rb") as f:
+        payload = f.read()
+    headers = dict(_headers(supabase_key), **{
+        "Content-Type": content_type,
+        "cache-control": cache_control,
+        "x-upsert": "true",
+    })
+    url = f"{supabase_url}/storage/v1/object/{SNAPSHOT_BUCKET}/{name}"
+    response = requests.post(url, headers=headers, data=payload, timeout=30)
+    if response.status_code not in [200, 201]:
+        raise RuntimeError(f"Upload of {name} failed: {response.text}")
+
+
+def upload_snapshot_variants(supabase_url, supabase_key, name, cache_control):
+    """Upload a snapshot and its precompressed variants.
+       The variants are stored as opaque bytes; the API sets Content-Encoding when serving them."""
+    upload_snapshot(supabase_url, supabase_key, name, cache_control)
+    for suffix in (".gz", ".br"):
+        if os.path.exists(os.path.join(SNAPSHOT_DIR, name + suffix)):
+            upload_snapshot(supabase_url, supabase_key, name + suffix, cache_control, "application/octet-stream")
+
+
+def delete_snapshots(supabase_url, supabase_key, names):
+    """Remove superseded snapshot objects (and their variants) from the bucket."""
+    objects = [name + suffix for name in names for suffix in ("", ".gz", ".br")]
+    url = f"{supabase_url}/storage/v1/object/{SNAPSHOT_BUCKET}"
+    response = requests.delete(url, headers=_headers(supabase_key), json={"prefixes": objects}, timeout=30)
+    if response.status_code not in [200, 204]:
+        raise RuntimeError(f"Deleting superseded snapshots failed: {response.text}")
+
+
+def publish_snapshots(tournament_keys):
+    """Rebuild snapshots for the given tournaments and the years they belong to.
+       Returns True if every snapshot was written."""
+    supabase_url = os.environ.get("SUPABASE_URL")
+    supabase_key = os.environ.get("SUPABASE_KEY")
+
+    if not supabase_url or not supabase_key:
+        print("Supabase not configured, cannot build snapshots.")
+        return False
+
+    if not tournament_keys:
+        return True
+
+    headers = _headers(supabase_key)
+    manifest = _load_manifest()
+    written = []
+
+    try:
+        tournaments = _fetch_all(f"{supabase_url}/rest/v1/tournaments", headers, {
+            "select": ",".join(TOURNAMENT_FIELDS),
+            "external_id": f"in.({','.join(tournament_keys)})",
+        })
+
+        for t in tournaments:
+            rows = _fetch_all(f"{supabase_url}/rest/v1/matches", headers, {
+                "select": MATCH_SELECT,
+                "rounds.tournaments.id": f"eq.{t['id']}",
+                "order": "id",
+            })
+            document = {
+                "tournament": {k: t.get(k) for k in TOURNAMENT_FIELDS},
+                "matches": [flatten_match(row) for row in rows],
+            }
+            t_id = str(t["id"])
+            previous = manifest["tournaments"].get(t_id)
+            manifest["tournaments"][t_id] = dict(
+                write_snapshot(f"tournament-{t_id}", document, previous),
+                year=t.get("year"),
+            )
+            _retire(manifest, previous, manifest["tournaments"][t_id])
+            written.append(manifest["tournaments"][t_id]["file"])
+            print(f"  ✓ Snapshot for {t['name']}: {written[-1]}")
+
+        for year in sorted({t["year"] for t in tournaments if t.get("year")}):
+            year_tournaments = _fetch_all(f"{supabase_url}/rest/v1/tournaments", headers, {
+                "select": ",".join(TOURNAMENT_FIELDS),
+                "year": f"eq.{year}",
+                "order": "id",
+            })
+            rows = _fetch_all(f"{supabase_url}/rest/v1/matches", headers, {
+                "select": MATCH_SELECT,
+                "rounds.tournaments.year": f"eq.{year}",
+                "order": "id",
+            })
+            document = {
+                "year": year,
+                "tournaments": [{k: t.get(k) for k in TOURNAMENT_FIELDS} for t in year_tournaments],
+                "matches": [flatten_match(row) for row in rows],
+            }
+            previous = manifest["years"].get(str(year))
+            manifest["years"][str(year)] = write_snapshot(f"year-{year}", document, previous)
+            _retire(manifest, previous, manifest["years"][str(year)])
+            written.append(manifest["years"][str(year)]["file"])
+            print(f"  ✓ Snapshot for {year}: {written[-1]}")
+    except Exception as e:
+        print(f"  Error building snapshots: {e}")
+        return False
+
+    try:
+        all_tournaments = _fetch_all(f"{supabase_url}/rest/v1/tournaments", headers, {
+            "select": ",".join(TOURNAMENT_FIELDS),
+            "order": "year.desc,id",
+        })
+    except Exception as e:
+        print(f"  Error building metadata snapshot: {e}")
+        return False
+
+    generated_at = datetime.now(timezone.utc).isoformat()
+    _write_atomic(
+        os.path.join(SNAPSHOT_DIR, METADATA_NAME),
+        json.dumps({
+            # The API ignores metadata older than METADATA_SNAPSHOT_MAX_AGE.
+            "generated_at": generated_at,
+            "years": sorted({t["year"] for t in all_tournaments if t.get("year")}, reverse=True),
+            "tournaments": all_tournaments,
+        }, ensure_ascii=False).encode("utf-8"),
+    )
+
+    manifest["generated_at"] = generated_at
+    _write_atomic(
+        os.path.join(SNAPSHOT_DIR, MANIFEST_NAME),
+        json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"),
+    )
+
+    if SNAPSHOT_BUCKET:
+        try:
+            for name in written:
+                upload_snapshot_variants(supabase_url, supabase_key, name, "public, max-age=31536000, immutable")
+            upload_snapshot(supabase_url, supabase_key, METADATA_NAME, "public, max-age=300")
+            upload_snapshot(supabase_url, supabase_key, MANIFEST_NAME, "public, max-age=300")
+            print(f"  ✓ Uploaded {len(written)} snapshots to bucket '{SNAPSHOT_BUCKET}'.")
+        except Exception as e:
+            print(f"  Error uploading snapshots: {e}")
+            return False
+
+        # Only after the new manifest is live; clients holding the old one fall back to /matches.
+        if manifest["retired"]:
+            try:
+                delete_snapshots(supabase_url, supabase_key, manifest["retired"])
+                print(f"  ✓ Removed {len(manifest['retired'])} superseded snapshots from the bucket.")
+                manifest["retired"] = []
+                _write_atomic(
+                    os.path.join(SNAPSHOT_DIR, MANIFEST_NAME),
+                    json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"),
+                )
+            except Exception as e:
+                print(f"  Warning: Could not remove superseded snapshots: {e}")
+
+    return True
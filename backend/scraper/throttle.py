@@ -0,0 +1,78 @@
+"""Adaptive per-host request rate control for page loads."""
+import time
+import threading
+from urllib.parse import urlparse
+
+from .config import RATE_LIMIT, MAX_RATE_LIMIT
+
+class TokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate, capacity=1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self):
+        """Consume a token and return 0, or return how many seconds to wait for one."""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+class HostRateController:
+    """One token bucket per host whose rate adapts to how the host responds.
+
+    Successful page loads raise the rate additively up to `max_rate`; timeouts
+    and errors halve it down to `min_rate` (AIMD), so the scraper settles at the
+    fastest pace the site tolerates.
+    """
+
+    def __init__(self, rate=RATE_LIMIT, min_rate=0.05, max_rate=MAX_RATE_LIMIT, step=0.05):
+        self.initial_rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, rate)
+        self.step = step
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, url):
+        host = urlparse(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.initial_rate)
+        return self._buckets[host]
+
+    def acquire(self, url):
+        """Block until a request to the host of `url` is allowed."""
+        while True:
+            with self._lock:
+                wait = self._bucket(url).take()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def record_success(self, url):
+        with self._lock:
+            bucket = self._bucket(url)
+            # Settle tokens earned at the old rate before changing it.
+            bucket._refill()
+            bucket.rate = min(self.max_rate, bucket.rate + self.step)
+
+    def record_failure(self, url):
+        with self._lock:
+            bucket = self._bucket(url)
+            # Settle tokens earned at the old rate before changing it.
+            bucket._refill()
+            bucket.rate = max(self.min_rate, bucket.rate / 2)
+            print(f"  Slowing down {urlparse(url).netloc} to {bucket.rate:.2f} req/s")
+
+    def rate(self, url):
+        with self._lock:
+            return self._bucket(url).rate
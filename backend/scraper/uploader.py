@@ -0,0 +1,85 @@
+"""Background uploader that persists extracted matches in micro-batches."""
+import time
+import queue
+import threading
+
+from .config import UPLOAD_BATCH_SIZE
+from .database import upsert_matches
+from .checkpoint import save_checkpoint
+from .odds_history import record_odds_snapshots
+
+FLUSH_INTERVAL = 5
+_STOP = object()
+
+class MatchUploader:
+    """Consume extracted matches on a worker thread and upsert them in batches.
+
+    Extraction keeps driving the browser while earlier batches are uploaded, and
+    every successful batch is recorded in the tournament checkpoint.
+    """
+
+    def __init__(self, tournament_key, tournament_id, uploaded=None, started_at=None, batch_size=UPLOAD_BATCH_SIZE):
+        self.tournament_key = tournament_key
+        self.tournament_id = tournament_id
+        self.uploaded = set(uploaded or ())
+        # A resumed run keeps the original start time so chained resumes still expire.
+        self.started_at = started_at or time.time()
+        self.batch_size = max(1, batch_size)
+        self.failed = 0
+        self._round_ids = {}
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"uploader-{tournament_key}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def put(self, match_data):
+        self._queue.put(match_data)
+
+    def close(self):
+        """Flush pending matches, stop the worker and return True if nothing failed."""
+        self._queue.put(_STOP)
+        self._thread.join()
+        return self.failed == 0
+
+    def _run(self):
+        batch = []
+        while True:
+            try:
+                item = self._queue.get(timeout=FLUSH_INTERVAL)
+            except queue.Empty:
+                if batch:
+                    self._flush(batch)
+                    batch = []
+                continue
+
+            if item is _STOP:
+                if batch:
+                    self._flush(batch)
+                return
+
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+
+    def _flush(self, batch):
+        try:
+            ok = upsert_matches(self.tournament_id, batch, self._round_ids)
+        except Exception as e:
+            print(f"  Error uploading batch: {e}")
+            ok = False
+
+        if not ok:
+            self.failed += len(batch)
+            return
+
+        if not record_odds_snapshots(batch):
+            print("  Warning: Odds history not updated for this batch.")
+
+        self.uploaded.update(m['id'] for m in batch)
+        try:
+            save_checkpoint(self.tournament_key, self.uploaded, self.started_at)
+        except Exception as e:
+            print(f"  Warning: Could not write checkpoint: {e}")
@@ -0,0 +1,103 @@
+"""Cross-process response cache backed by files in a shared directory.
+
+All workers read and write the same directory (ideally /dev/shm), so a
+response serialized by one worker is served by every worker without each of
+them querying upstream. Each hit reads the file into the worker; the saving is
+the skipped upstream query and serialization, not memory copies.
+
+The directory is bounded: expired entries are deleted on read, and every write
+sweeps expired files and evicts the oldest ones beyond `max_entries` or
+`max_bytes`.
+"""
+import os
+import time
+import struct
+import hashlib
+
+HEADER = struct.Struct("<d")
+TMP_SUFFIX = ".tmp"
+
+
+class SharedCache:
+    def __init__(self, directory, ttl=300, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode()).hexdigest())
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def get(self, key):
+        """Return the cached bytes for `key`, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                payload = f.read()
+        except OSError:
+            return None
+
+        if len(payload) < HEADER.size:
+            return None
+        (expires_at,) = HEADER.unpack_from(payload)
+        if expires_at < time.time():
+            self._remove(path)
+            return None
+        return payload[HEADER.size:]
+
+    def set(self, key, payload, ttl=None):
+        """Atomically publish `payload` for all workers, then keep the directory within bounds."""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}{TMP_SUFFIX}"
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(expires_at))
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self._remove(tmp_path)
+            print(f"Shared cache write failed: {e}")
+            return
+        self.sweep()
+
+    def sweep(self):
+        """Delete expired entries and evict the oldest ones beyond the size caps."""
+        now = time.time()
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+                if name.endswith(TMP_SUFFIX):
+                    # Leftover from a worker that died mid-write.
+                    if now - stat.st_mtime > 60:
+                        self._remove(path)
+                    continue
+                with open(path, "rb") as f:
+                    header = f.read(HEADER.size)
+            except OSError:
+                continue
+            if len(header) < HEADER.size or HEADER.unpack(header)[0] < now:
+                self._remove(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            _, size, path = entries.pop(0)
+            self._remove(path)
+            total -= size